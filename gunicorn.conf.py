@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Sentinel API.
+
+Run with:
+    gunicorn src.api.main:app -c gunicorn.conf.py
+
+One uvicorn event loop per worker process; CPU-bound detection is
+already offloaded to each worker's process pool (see src/api/main.py),
+so the loops stay responsive while detection crunches.
+"""
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = 2 * os.cpu_count() + 1
+worker_class = "uvicorn.workers.UvicornWorker"
+worker_connections = 1000
+keepalive = 5
@@ -6,8 +6,8 @@ from src.drift_detection.detector import DriftDetector
 
 # Load data
 print("Loading data...")
-reference_df = pd.read_csv("data/raw/reference_data.csv")
-production_df = pd.read_csv("data/raw/production_data.csv")
+reference_df = pd.read_parquet("data/raw/reference_data.parquet")
+production_df = pd.read_parquet("data/raw/production_data.parquet")
 
 print(f"Reference data: {reference_df.shape}")
 print(f"Production data: {production_df.shape}")
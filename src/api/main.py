@@ -1,17 +1,96 @@
 """
 Sentinel API - Main FastAPI application
 """
-from fastapi import FastAPI, HTTPException
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import orjson
+import pyarrow as pa
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from src.drift_detection.detector import DriftDetector
 
+# Drift detection is pure CPU work (sorts, SciPy stats); run it in worker
+# processes so the event loop stays free to serve other requests.
+EXECUTOR = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+# Per-worker LRU of precomputed reference-side state, keyed by content
+# hash. The common deployment scores one fixed reference dataset against
+# many production batches; on a hit all reference-side work is skipped.
+_REFERENCE_CACHE: OrderedDict = OrderedDict()
+_REFERENCE_CACHE_SIZE = 8
+
+
+def _reference_cache_key(
+    reference_df: pd.DataFrame,
+    categorical_features: Optional[List[str]],
+    max_sample: Optional[int]
+) -> tuple:
+    """Cache key from the DataFrame's content hash and the detector knobs."""
+    digest = hashlib.blake2b(
+        pd.util.hash_pandas_object(reference_df, index=False).to_numpy().tobytes()
+    ).digest()
+    columns = tuple(reference_df.columns)
+    categorical = tuple(categorical_features) if categorical_features is not None else None
+    return digest, columns, categorical, max_sample
+
+
+def _cached_reference(
+    reference_df: pd.DataFrame,
+    categorical_features: Optional[List[str]],
+    max_sample: Optional[int]
+) -> Dict:
+    """Precomputed reference-side detector state, memoized per worker."""
+    key = _reference_cache_key(reference_df, categorical_features, max_sample)
+    cached = _REFERENCE_CACHE.get(key)
+    if cached is None:
+        cached = DriftDetector.precompute_reference(
+            reference_df,
+            categorical_features=categorical_features,
+            max_sample=max_sample
+        )
+        _REFERENCE_CACHE[key] = cached
+        if len(_REFERENCE_CACHE) > _REFERENCE_CACHE_SIZE:
+            _REFERENCE_CACHE.popitem(last=False)
+    else:
+        _REFERENCE_CACHE.move_to_end(key)
+    return cached
+
+
+def _run_detection(
+    reference_df: pd.DataFrame,
+    production_df: pd.DataFrame,
+    categorical_features: Optional[List[str]],
+    significance_level: float,
+    psi_threshold: float,
+    max_sample: Optional[int]
+) -> Dict:
+    """Build a DriftDetector and run it; executed in a pool worker."""
+    detector = DriftDetector(
+        reference_data=reference_df,
+        production_data=production_df,
+        categorical_features=categorical_features,
+        significance_level=significance_level,
+        psi_threshold=psi_threshold,
+        max_sample=max_sample,
+        precomputed_reference=_cached_reference(
+            reference_df, categorical_features, max_sample
+        )
+    )
+    return detector.detect_drift()
+
+
 app = FastAPI(
     title="Sentinel ML Monitoring",
     description="Automated ML model performance debugging and root cause analysis",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -25,13 +104,17 @@ app.add_middleware(
 
 
 # Request/Response Models
-class DriftDetectionRequest(BaseModel):
-    """Request body for drift detection"""
-    reference_data: List[Dict[str, Any]]
-    production_data: List[Dict[str, Any]]
+class DriftDetectionConfig(BaseModel):
+    """Scalar configuration fields of a drift detection request.
+
+    The tabular reference_data/production_data fields are parsed with
+    orjson and handed straight to pandas; validating 30k rows of
+    Dict[str, Any] through pydantic would cost more than the detection.
+    """
     categorical_features: List[str] = None
     significance_level: float = 0.05
     psi_threshold: float = 0.25
+    max_sample: Optional[int] = 10_000
 
 
 class DriftDetectionResponse(BaseModel):
@@ -68,55 +151,122 @@ async def health_check():
     }
 
 
-@app.post("/detect-drift", response_model=DriftDetectionResponse)
-async def detect_drift(request: DriftDetectionRequest):
+@app.post("/detect-drift", response_model=DriftDetectionResponse,
+          response_class=ORJSONResponse)
+async def detect_drift(request: Request):
     """
     Detect drift between reference and production data.
-    
-    Args:
-        request: DriftDetectionRequest with reference and production data
-        
+
+    Expects a JSON body with `reference_data` and `production_data` as
+    lists of row dicts, plus the optional scalar fields of
+    DriftDetectionConfig.
+
     Returns:
         DriftDetectionResponse with drift detection results
     """
     try:
-        # Convert JSON to DataFrames
-        reference_df = pd.DataFrame(request.reference_data)
-        production_df = pd.DataFrame(request.production_data)
-        
+        payload = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body is not valid JSON")
+
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="JSON body must be an object")
+
+    try:
+        config = DriftDetectionConfig(**{
+            key: value for key, value in payload.items()
+            if key not in ('reference_data', 'production_data')
+        })
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False)
+        )
+
+    # Convert JSON rows to DataFrames without pydantic walking each row
+    reference_df = pd.DataFrame(payload.get('reference_data', []))
+    production_df = pd.DataFrame(payload.get('production_data', []))
+
+    return await _detect_and_respond(reference_df, production_df, config)
+
+
+@app.post("/detect-drift/arrow", response_model=DriftDetectionResponse,
+          response_class=ORJSONResponse)
+async def detect_drift_arrow(
+    request: Request,
+    significance_level: float = 0.05,
+    psi_threshold: float = 0.25
+):
+    """
+    Detect drift from an Arrow IPC payload.
+
+    The body must contain two concatenated Arrow IPC streams: the
+    reference table followed by the production table. Columns arrive
+    pre-typed and columnar, so DataFrame construction is near-free
+    compared to the JSON rows endpoint; scalar knobs travel as query
+    parameters. The JSON endpoint remains for backward compatibility.
+    """
+    body = await request.body()
+    try:
+        reader = pa.BufferReader(body)
+        reference_df = pa.ipc.open_stream(reader).read_all().to_pandas()
+        production_df = pa.ipc.open_stream(reader).read_all().to_pandas()
+    except pa.ArrowInvalid:
+        raise HTTPException(
+            status_code=400,
+            detail="Body is not a pair of Arrow IPC streams (reference, production)"
+        )
+
+    config = DriftDetectionConfig(
+        significance_level=significance_level,
+        psi_threshold=psi_threshold
+    )
+    return await _detect_and_respond(reference_df, production_df, config)
+
+
+async def _detect_and_respond(
+    reference_df: pd.DataFrame,
+    production_df: pd.DataFrame,
+    config: DriftDetectionConfig
+) -> ORJSONResponse:
+    """Shared tail of the drift endpoints: validate, detect, serialize."""
+    try:
         # Validate data
         if reference_df.empty or production_df.empty:
             raise HTTPException(
                 status_code=400,
                 detail="Reference or production data is empty"
             )
-        
-        # Create detector
-        detector = DriftDetector(
-            reference_data=reference_df,
-            production_data=production_df,
-            categorical_features=request.categorical_features,
-            significance_level=request.significance_level,
-            psi_threshold=request.psi_threshold
+
+        # Run detection off the event loop
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(
+            EXECUTOR,
+            _run_detection,
+            reference_df,
+            production_df,
+            config.categorical_features,
+            config.significance_level,
+            config.psi_threshold,
+            config.max_sample
         )
-        
-        # Run detection
-        results = detector.detect_drift()
-        
+
         # Generate summary
         if results['drift_detected']:
             num_drifted = len(results['features_with_drift'])
             summary = f"⚠️ Drift detected in {num_drifted} feature(s): {', '.join(results['features_with_drift'])}"
         else:
             summary = "✅ No significant drift detected"
-        
-        return DriftDetectionResponse(
-            drift_detected=results['drift_detected'],
-            features_with_drift=results['features_with_drift'],
-            feature_details=results['feature_details'],
-            summary=summary
-        )
-        
+
+        # Return a Response directly: orjson serializes the potentially large
+        # feature_details dict without pydantic re-validating every field.
+        return ORJSONResponse(content={
+            'drift_detected': results['drift_detected'],
+            'features_with_drift': results['features_with_drift'],
+            'feature_details': results['feature_details'],
+            'summary': summary
+        })
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -6,11 +6,31 @@ import pandas as pd
 import plotly.express as px
 from src.drift_detection.detector import DriftDetector
 
+try:
+    from pyarrow import csv as pa_csv
+except ImportError:
+    pa_csv = None
+
 st.set_page_config(page_title="Sentinel - Drift Detection", layout="wide")
 
 st.title("🔍 Sentinel - ML Drift Detection Dashboard")
 st.markdown("Upload your reference and production datasets to detect drift")
 
+
+def load_table(uploaded_file) -> pd.DataFrame:
+    """Read an uploaded dataset; Parquet preferred, CSV still accepted."""
+    if uploaded_file.name.endswith('.parquet'):
+        return pd.read_parquet(uploaded_file)
+    if pa_csv is not None:
+        # Arrow's multithreaded CSV reader parses straight into columnar
+        # buffers and hands them to pandas, far faster than pd.read_csv.
+        table = pa_csv.read_csv(
+            uploaded_file,
+            read_options=pa_csv.ReadOptions(use_threads=True)
+        )
+        return table.to_pandas()
+    return pd.read_csv(uploaded_file)
+
 # Sidebar for configuration
 st.sidebar.header("Configuration")
 significance_level = st.sidebar.slider("Significance Level", 0.01, 0.10, 0.05, 0.01)
@@ -21,16 +41,16 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("📊 Reference Data (Baseline)")
-    reference_file = st.file_uploader("Upload Reference CSV", type=['csv'], key='ref')
-    
+    reference_file = st.file_uploader("Upload Reference Dataset", type=['csv', 'parquet'], key='ref')
+
 with col2:
     st.subheader("📊 Production Data (Current)")
-    production_file = st.file_uploader("Upload Production CSV", type=['csv'], key='prod')
+    production_file = st.file_uploader("Upload Production Dataset", type=['csv', 'parquet'], key='prod')
 
 if reference_file and production_file:
     # Load data
-    reference_df = pd.read_csv(reference_file)
-    production_df = pd.read_csv(production_file)
+    reference_df = load_table(reference_file)
+    production_df = load_table(production_file)
     
     # Show data previews
     with st.expander("Preview Reference Data"):
@@ -127,4 +147,4 @@ if reference_file and production_file:
                 st.plotly_chart(fig, use_container_width=True)
 
 else:
-    st.info("👆 Upload both reference and production CSV files to get started")
\ No newline at end of file
+    st.info("👆 Upload both reference and production datasets to get started")
\ No newline at end of file